@@ -6,17 +6,18 @@ Main application entry point
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
+import asyncio
 import os
 from dotenv import load_dotenv
 from typing import List, Optional
 import uuid
 from datetime import datetime
-from modules.distractor_generator import DistractorGenerator
 from modules.file_processor import FileProcessor
-from modules.question_generator import QuestionGenerator
 from modules.quiz_evaluator import QuizEvaluator
 from modules.exporter import ResultExporter
+from modules import worker_pool
 from modules.database import SupabaseClient
+from modules.gpu_limiter import GPUSlotLimiter, GPUBusyError
 
 # Load environment variables
 load_dotenv()
@@ -39,19 +40,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize modules
+# Initialize modules (models and clients are built in startup())
 file_processor = FileProcessor()
-question_generator = QuestionGenerator()
-distractor_generator = DistractorGenerator()
 quiz_evaluator = QuizEvaluator()
 exporter = ResultExporter()
-db_client = SupabaseClient()
+question_generator = None
+distractor_generator = None
+db_client: Optional[SupabaseClient] = None
+gpu_limiter: Optional[GPUSlotLimiter] = None
 
 # Create temp directory for file processing
 os.makedirs("temp", exist_ok=True)
 os.makedirs("exports", exist_ok=True)
 
 
+@app.on_event("startup")
+async def startup():
+    """Load the models and open the database and Redis clients"""
+    global question_generator, distractor_generator, db_client, gpu_limiter
+
+    # Imported here, not at module level: worker_pool children re-run this file
+    # as __mp_main__, and module-level imports would load torch in every worker
+    from modules.distractor_generator import DistractorGenerator
+    from modules.question_generator import QuestionGenerator
+
+    question_generator = QuestionGenerator()
+    distractor_generator = DistractorGenerator()
+    db_client = SupabaseClient()
+    gpu_limiter = GPUSlotLimiter()
+
+    # Each worker re-imports main.py on start; do that before the first request
+    await asyncio.to_thread(worker_pool.warm_up)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release pooled database and Redis connections and worker processes"""
+    await db_client.close()
+    await gpu_limiter.close()
+    worker_pool.shutdown()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -94,8 +123,8 @@ async def upload_file(
         with open(temp_path, "wb") as f:
             f.write(content)
 
-        # Extract text
-        extracted_text = file_processor.extract_text(temp_path, file_ext)
+        # Extract text (off the event loop; large PDFs fan out to the worker pool)
+        extracted_text = await asyncio.to_thread(file_processor.extract_text, temp_path, file_ext)
 
         if not extracted_text or len(extracted_text.strip()) < 100:
             os.remove(temp_path)
@@ -151,24 +180,31 @@ async def generate_questions(
         if not extracted_text:
             raise HTTPException(status_code=400, detail="No text content available")
 
-        # Update processing status
-        await db_client.update_file_status(file_id, "processing")
-
-        # Generate questions
-        questions = await question_generator.generate_mcqs(
-            text=extracted_text,
-            num_questions=num_questions,
-            difficulty=difficulty
-        )
+        # Generate questions (bounded number of concurrent GPU jobs)
+        try:
+            async with gpu_limiter.slot(file_id):
+                # Update processing status
+                await db_client.update_file_status(file_id, "processing")
+
+                questions = await question_generator.generate_mcqs(
+                    text=extracted_text,
+                    num_questions=num_questions,
+                    difficulty=difficulty
+                )
+        except GPUBusyError:
+            raise HTTPException(
+                status_code=429,
+                detail="Question generator is busy. Please try again shortly."
+            )
         print(f"DEBUG: Generated {len(questions)} candidate questions for file {file_id}")
 
-        # Store questions in database
+        # Store questions in database (single bulk insert)
+        question_ids = await db_client.create_questions_bulk(
+            file_id=file_id,
+            question_list=questions
+        )
         stored_questions = []
-        for q in questions:
-            question_id = await db_client.create_question(
-                file_id=file_id,
-                question_data=q
-            )
+        for q, question_id in zip(questions, question_ids):
             q['id'] = question_id
             stored_questions.append(q)
 
@@ -330,20 +366,16 @@ async def export_results(
     Export quiz questions or results
     """
     try:
-        # Get session and questions
-        session = await db_client.get_quiz_session(session_id)
+        # Get session, questions and (for results) responses
+        session, questions, responses = await db_client.load_session_bundle(
+            session_id,
+            include_responses=export_type == "results_with_answers"
+        )
         if not session:
             raise HTTPException(status_code=404, detail="Quiz session not found")
 
-        questions = await db_client.get_questions_by_file(session["file_id"])
-
-        if export_type == "results_with_answers":
-            responses = await db_client.get_quiz_responses(session_id)
-        else:
-            responses = None
-
         # Generate export file
-        file_path = exporter.export(
+        file_path = await exporter.export(
             questions=questions,
             responses=responses,
             export_type=export_type,
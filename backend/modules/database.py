@@ -3,12 +3,23 @@ Database Module - Supabase Client
 Handles all database operations for the MCQ generator
 """
 
+import asyncio
 import os
-from supabase import create_client, Client
-from typing import Optional, List, Dict
+import httpx
+from cachetools import TTLCache
+from supabase import acreate_client, AsyncClient
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 
 
+# Read-through caches for read-mostly records (per process)
+CACHE_MAXSIZE = 512
+CACHE_TTL_SECONDS = 60
+
+# Long-lived keep-alive pool shared by all PostgREST requests
+HTTP_POOL_LIMITS = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=120)
+
+
 class SupabaseClient:
     """Manages all Supabase database operations"""
 
@@ -19,7 +30,46 @@ class SupabaseClient:
         if not supabase_url or not supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment")
 
-        self.client: Client = create_client(supabase_url, supabase_key)
+        self._url = supabase_url
+        self._key = supabase_key
+        self._client: Optional[AsyncClient] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._client_lock = asyncio.Lock()
+
+        # Cache reads/writes never span an await, so no lock is needed on the event loop
+        self._file_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
+        self._questions_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
+
+    async def _get_client(self) -> AsyncClient:
+        """Create the async Supabase client on first use"""
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    client = await acreate_client(self._url, self._key)
+                    await self._attach_http_pool(client)
+                    self._client = client
+        return self._client
+
+    async def _attach_http_pool(self, client: AsyncClient) -> None:
+        """Swap the PostgREST session for a pooled HTTP/2 client with keep-alive"""
+        session = client.postgrest.session
+        self._http = httpx.AsyncClient(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=session.timeout,
+            follow_redirects=True,
+            http2=True,
+            limits=HTTP_POOL_LIMITS
+        )
+        await session.aclose()
+        client.postgrest.session = self._http
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self._client = None
 
     async def create_file_record(
         self,
@@ -43,33 +93,68 @@ class SupabaseClient:
             "processing_status": "pending"
         }
 
-        response = self.client.table("uploaded_files").insert(data).execute()
+        client = await self._get_client()
+        response = await client.table("uploaded_files").insert(data).execute()
         return response.data[0] if response.data else None
 
     async def get_file(self, file_id: str) -> Optional[Dict]:
         """Get file record by ID"""
-        response = self.client.table("uploaded_files").select("*").eq("id", file_id).execute()
-        return response.data[0] if response.data else None
+        cached = self._file_cache.get(file_id)
+        if cached is not None:
+            return cached
+
+        client = await self._get_client()
+        response = await client.table("uploaded_files").select("*").eq("id", file_id).execute()
+        file_record = response.data[0] if response.data else None
+
+        if file_record is not None:
+            self._file_cache[file_id] = file_record
+        return file_record
 
     async def get_all_files(self, user_id: Optional[str] = None) -> List[Dict]:
         """Get all files, optionally filtered by user"""
-        query = self.client.table("uploaded_files").select("*").order("upload_date", desc=True)
+        client = await self._get_client()
+        query = client.table("uploaded_files").select("*").order("upload_date", desc=True)
 
         if user_id:
             query = query.eq("user_id", user_id)
 
-        response = query.execute()
+        response = await query.execute()
         return response.data if response.data else []
 
     async def update_file_status(self, file_id: str, status: str) -> None:
         """Update file processing status"""
-        self.client.table("uploaded_files").update({
+        client = await self._get_client()
+        await client.table("uploaded_files").update({
             "processing_status": status
         }).eq("id", file_id).execute()
+        self._file_cache.pop(file_id, None)
 
     async def create_question(self, file_id: str, question_data: Dict) -> str:
         """Create a new question record"""
-        data = {
+        data = self._question_row(file_id, question_data)
+
+        client = await self._get_client()
+        response = await client.table("generated_questions").insert(data).execute()
+        self._questions_cache.pop(file_id, None)
+        return response.data[0]["id"] if response.data else None
+
+    async def create_questions_bulk(self, file_id: str, question_list: List[Dict]) -> List[str]:
+        """Create several question records in a single insert request"""
+        if not question_list:
+            return []
+
+        rows = [self._question_row(file_id, q) for q in question_list]
+
+        client = await self._get_client()
+        response = await client.table("generated_questions").insert(rows).execute()
+        self._questions_cache.pop(file_id, None)
+        return [row["id"] for row in response.data] if response.data else []
+
+    @staticmethod
+    def _question_row(file_id: str, question_data: Dict) -> Dict:
+        """Map a generated question to a generated_questions row"""
+        return {
             "file_id": file_id,
             "question_text": question_data["question"],
             "option_a": question_data["options"]["A"],
@@ -83,16 +168,21 @@ class SupabaseClient:
             "topic": question_data.get("topic", "")
         }
 
-        response = self.client.table("generated_questions").insert(data).execute()
-        return response.data[0]["id"] if response.data else None
-
     async def get_questions_by_file(self, file_id: str) -> List[Dict]:
         """Get all questions for a specific file"""
-        response = self.client.table("generated_questions").select("*").eq(
+        cached = self._questions_cache.get(file_id)
+        if cached is not None:
+            return cached
+
+        client = await self._get_client()
+        response = await client.table("generated_questions").select("*").eq(
             "file_id", file_id
         ).order("generated_date").execute()
 
-        return response.data if response.data else []
+        questions = response.data if response.data else []
+        if questions:
+            self._questions_cache[file_id] = questions
+        return questions
 
     async def create_quiz_session(
         self,
@@ -110,17 +200,20 @@ class SupabaseClient:
             "status": "in_progress"
         }
 
-        response = self.client.table("quiz_sessions").insert(data).execute()
+        client = await self._get_client()
+        response = await client.table("quiz_sessions").insert(data).execute()
         return response.data[0]["id"] if response.data else None
 
     async def get_quiz_session(self, session_id: str) -> Optional[Dict]:
         """Get quiz session by ID"""
-        response = self.client.table("quiz_sessions").select("*").eq("id", session_id).execute()
+        client = await self._get_client()
+        response = await client.table("quiz_sessions").select("*").eq("id", session_id).execute()
         return response.data[0] if response.data else None
 
     async def complete_quiz_session(self, session_id: str) -> None:
         """Mark quiz session as completed"""
-        self.client.table("quiz_sessions").update({
+        client = await self._get_client()
+        await client.table("quiz_sessions").update({
             "status": "completed",
             "end_time": datetime.utcnow().isoformat()
         }).eq("id", session_id).execute()
@@ -140,17 +233,44 @@ class SupabaseClient:
             "is_correct": is_correct
         }
 
-        response = self.client.table("quiz_responses").insert(data).execute()
+        client = await self._get_client()
+        response = await client.table("quiz_responses").insert(data).execute()
         return response.data[0]["id"] if response.data else None
 
     async def get_quiz_responses(self, session_id: str) -> List[Dict]:
         """Get all responses for a quiz session"""
-        response = self.client.table("quiz_responses").select(
+        client = await self._get_client()
+        response = await client.table("quiz_responses").select(
             "*, generated_questions(*)"
         ).eq("session_id", session_id).execute()
 
         return response.data if response.data else []
 
+    async def load_session_bundle(
+        self,
+        session_id: str,
+        include_responses: bool = True
+    ) -> Tuple[Optional[Dict], List[Dict], Optional[List[Dict]]]:
+        """
+        Load a quiz session with its questions and (optionally) responses
+
+        The session and its responses are fetched concurrently; questions
+        depend on the session's file_id and are fetched afterwards.
+        """
+        if include_responses:
+            session, responses = await asyncio.gather(
+                self.get_quiz_session(session_id),
+                self.get_quiz_responses(session_id)
+            )
+        else:
+            session, responses = await self.get_quiz_session(session_id), None
+
+        if not session:
+            return None, [], responses
+
+        questions = await self.get_questions_by_file(session["file_id"])
+        return session, questions, responses
+
     async def create_export_record(
         self,
         session_id: str,
@@ -164,5 +284,6 @@ class SupabaseClient:
             "file_format": file_format
         }
 
-        response = self.client.table("export_history").insert(data).execute()
+        client = await self._get_client()
+        response = await client.table("export_history").insert(data).execute()
         return response.data[0]["id"] if response.data else None
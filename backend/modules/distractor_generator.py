@@ -1,23 +1,45 @@
 import torch
 from transformers import T5ForConditionalGeneration, T5Tokenizer
+from transformers.modeling_outputs import BaseModelOutput
+import hashlib
 import logging
+from collections import OrderedDict
+from typing import List, Tuple
 
 logger = logging.getLogger("distractor_generator")
 logger.setLevel(logging.INFO)
 
+# Number of prompts whose encoder outputs are kept for reuse
+ENCODER_CACHE_SIZE = 64
+
 
 class DistractorGenerator:
 
     def __init__(self):
         logger.info("🔹 Loading DistractorGenerator model...")
 
+        # sha256(prompt) -> encoder hidden states (seq_len, d_model), LRU ordered
+        self._encoder_cache = OrderedDict()
+
         self.device = 0 if torch.cuda.is_available() else -1
 
+        # bf16 halves weight bandwidth on GPU; T5 overflows in fp16, so fall back to fp32
+        if self.device >= 0 and torch.cuda.is_bf16_supported():
+            self.dtype = torch.bfloat16
+        else:
+            self.dtype = torch.float32
+
         model_path = "./MCQ_MODEL_Check/Dis_Model/dis_merged"
 
         try:
             self.tokenizer = T5Tokenizer.from_pretrained(model_path, local_files_only=True)
-            self.model = T5ForConditionalGeneration.from_pretrained(model_path, local_files_only=True)
+            self.model = T5ForConditionalGeneration.from_pretrained(
+                model_path,
+                torch_dtype=self.dtype,
+                local_files_only=True
+            )
+            # merged LoRA checkpoints may ship with the KV cache disabled
+            self.model.config.use_cache = True
 
             if self.device >= 0:
                 self.model = self.model.to(f"cuda:{self.device}")
@@ -32,44 +54,99 @@ class DistractorGenerator:
 
     def generate(self, question: str, answer: str, context: str, num=3):
 
-        if not self.model:
-            return []
+        results = self.generate_batch([(question, answer, context)], num=num)
+        return results[0] if results else []
+
+
+    def generate_batch(self, items: List[Tuple[str, str, str]], num=3) -> List[List[str]]:
+        """Generate distractors for several (question, answer, context) items in one forward pass"""
+
+        if not self.model or not items:
+            return [[] for _ in items]
 
         try:
 
-            prompt = (
+            prompts = [
                 f"question: {question} "
                 f"answer: {answer} "
                 f"context: {context}"
+                for question, answer, context in items
+            ]
+
+            encoder_outputs, attention_mask = self._encode(prompts)
+
+            outputs = self.model.generate(
+                encoder_outputs=encoder_outputs,
+                attention_mask=attention_mask,
+                max_length=80,
+                num_beams=num * 2,
+                num_return_sequences=num,
+                do_sample=False,
+                early_stopping=True,
+                use_cache=True,
             )
 
+            decoded = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+            # outputs are laid out as (batch * num); regroup per item
+            results = []
+            for idx in range(len(items)):
+                distractors = [d.strip() for d in decoded[idx * num:(idx + 1) * num]]
+                results.append(list(set(distractors))[:num])
+
+            return results
+
+        except Exception as e:
+            logger.error(f"❌ Distractor generation failed: {str(e)}")
+            return [[] for _ in items]
+
+
+    def _encode(self, prompts: List[str]):
+        """
+        Run the encoder for prompts not already cached and assemble a padded batch
+
+        The encoder is bidirectional, so outputs are reused only for identical prompts
+        (e.g. the same answer and context across questions of one document).
+        """
+        keys = [hashlib.sha256(p.encode("utf-8")).hexdigest() for p in prompts]
+        # one encoder row per unique prompt: QA often returns the same answer for several
+        # questions of a chunk, and those repeats arrive in the same batch
+        missing = list(dict.fromkeys(
+            (k, p) for k, p in zip(keys, prompts) if k not in self._encoder_cache
+        ))
+        device = self.model.device
+
+        if missing:
             inputs = self.tokenizer(
-                prompt,
+                [p for _, p in missing],
                 return_tensors="pt",
+                padding=True,
                 truncation=True,
                 max_length=256
             )
+            inputs = {k: v.to(device) for k, v in inputs.items()}
 
-            if self.device >= 0:
-                inputs = {k: v.to(f"cuda:{self.device}") for k, v in inputs.items()}
+            with torch.no_grad():
+                hidden = self.model.get_encoder()(**inputs).last_hidden_state
 
-            outputs = self.model.generate(
-                **inputs,
-                max_length=80,
-                num_beams=4,
-                num_return_sequences=num,
-                temperature=0.9,
-                do_sample=True,
-                top_k=40,
-            )
+            lengths = inputs["attention_mask"].sum(dim=1).tolist()
+            for row, (k, _) in enumerate(missing):
+                # clone so the entry does not keep the whole padded batch alive on the GPU
+                self._encoder_cache[k] = hidden[row, :lengths[row]].clone()
 
-            distractors = [
-                self.tokenizer.decode(o, skip_special_tokens=True).strip()
-                for o in outputs
-            ]
+        states = []
+        for k in keys:
+            self._encoder_cache.move_to_end(k)
+            states.append(self._encoder_cache[k])
 
-            return list(set(distractors))[:num]
+        while len(self._encoder_cache) > ENCODER_CACHE_SIZE:
+            self._encoder_cache.popitem(last=False)
 
-        except Exception as e:
-            logger.error(f"❌ Distractor generation failed: {str(e)}")
-            return []
+        max_len = max(s.shape[0] for s in states)
+        batch = states[0].new_zeros((len(states), max_len, states[0].shape[-1]))
+        attention_mask = torch.zeros((len(states), max_len), dtype=torch.long, device=device)
+        for row, state in enumerate(states):
+            batch[row, :state.shape[0]] = state
+            attention_mask[row, :state.shape[0]] = 1
+
+        return BaseModelOutput(last_hidden_state=batch), attention_mask
@@ -8,12 +8,125 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
+import docx
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from datetime import datetime
+import hashlib
+import json
 import os
+import re
+import zipfile
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+import time
+import uuid
+from contextlib import contextmanager
 from typing import List, Dict, Optional
+from . import worker_pool
+
+
+# Reuse an identical export for this many seconds before regenerating it
+EXPORT_CACHE_TTL = 3600
+
+# DOCX exports with more questions than this are streamed as raw WordprocessingML
+DOCX_STREAM_THRESHOLD = 50
+
+# python-docx's default template: the streamed writer reuses its styles, theme and
+# package parts so large exports look the same as python-docx ones
+_DOCX_TEMPLATE_PATH = os.path.join(os.path.dirname(docx.__file__), "templates", "default.docx")
+
+_DOCX_DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:body>'
+)
+
+
+@lru_cache(maxsize=1)
+def _load_docx_template():
+    """Return the template's package parts (minus document.xml) and its section properties"""
+    with zipfile.ZipFile(_DOCX_TEMPLATE_PATH) as template:
+        parts = [
+            (name, template.read(name))
+            for name in template.namelist()
+            if name != 'word/document.xml'
+        ]
+        document_xml = template.read('word/document.xml').decode('utf-8')
+
+    sect_pr = re.search(r'<w:sectPr\b.*?</w:sectPr>', document_xml, re.S).group(0)
+    return parts, sect_pr
+
+
+# Per-worker exporter, so styles are built once per process rather than pickled per call
+_worker_exporter: Optional["ResultExporter"] = None
+
+
+def _render_export(
+    questions: List[Dict],
+    responses: Optional[List[Dict]],
+    export_type: str,
+    file_format: str,
+    filename: str
+) -> str:
+    """Render an export inside a worker process"""
+    global _worker_exporter
+    if _worker_exporter is None:
+        _worker_exporter = ResultExporter()
+
+    if file_format == "pdf":
+        return _worker_exporter._export_to_pdf(questions, responses, export_type, filename)
+    return _worker_exporter._export_to_docx(questions, responses, export_type, filename)
+
+
+@contextmanager
+def _atomic_write_path(filepath: str):
+    """
+    Yield a temp path next to `filepath` and move it into place on success
+
+    The export cache serves any file at the final path, so a failed render must
+    never leave a partial file there, and a concurrent identical export must not
+    truncate a file that is still being streamed to another user.
+    """
+    tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _docx_run(text: str, bold: bool = False, italic: bool = False,
+              color: Optional[str] = None, size: Optional[int] = None) -> str:
+    """Render a WordprocessingML run (size in half-points)"""
+    props = ""
+    if bold:
+        props += "<w:b/>"
+    if italic:
+        props += "<w:i/>"
+    if color:
+        props += f'<w:color w:val="{color}"/>'
+    if size:
+        props += f'<w:sz w:val="{size}"/>'
+    if props:
+        props = f"<w:rPr>{props}</w:rPr>"
+    return f'<w:r>{props}<w:t xml:space="preserve">{escape(text or "")}</w:t></w:r>'
+
+
+def _docx_paragraph(*runs: str, style: Optional[str] = None, center: bool = False) -> str:
+    """Render a WordprocessingML paragraph from pre-rendered runs"""
+    props = ""
+    if style:
+        props += f'<w:pStyle w:val="{style}"/>'
+    if center:
+        props += '<w:jc w:val="center"/>'
+    if props:
+        props = f"<w:pPr>{props}</w:pPr>"
+    return f"<w:p>{props}{''.join(runs)}</w:p>"
 
 
 class ResultExporter:
@@ -23,7 +136,28 @@ class ResultExporter:
         self.export_dir = "exports"
         os.makedirs(self.export_dir, exist_ok=True)
 
-    def export(
+        # PDF styles are built once and shared by every export
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=RGBColor(0, 0, 139),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+
+        self.heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=RGBColor(0, 0, 0),
+            spaceAfter=12
+        )
+
+    async def export(
         self,
         questions: List[Dict],
         responses: Optional[List[Dict]],
@@ -44,20 +178,28 @@ class ResultExporter:
         Returns:
             Path to exported file
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{export_type}_{session_id}_{timestamp}"
-
-        if file_format == "pdf":
-            return self._export_to_pdf(
-                questions, responses, export_type, filename
-            )
-        elif file_format == "docx":
-            return self._export_to_docx(
-                questions, responses, export_type, filename
-            )
-        else:
+        if file_format not in ("pdf", "docx"):
             raise ValueError(f"Unsupported format: {file_format}")
 
+        # Same content -> same file name, so repeat downloads skip rendering
+        content_hash = hashlib.sha256(json.dumps(
+            {"qs": questions, "rs": responses, "type": export_type, "fmt": file_format},
+            sort_keys=True,
+            default=str
+        ).encode("utf-8")).hexdigest()
+        filename = f"{export_type}_{session_id}_{content_hash[:16]}"
+
+        cached_path = os.path.join(self.export_dir, f"{filename}.{file_format}")
+        if os.path.exists(cached_path) and time.time() - os.path.getmtime(cached_path) < EXPORT_CACHE_TTL:
+            return cached_path
+
+        # Rendering is CPU-bound pure Python: run it in the shared worker pool
+        # so the event loop stays responsive and concurrent exports use separate cores
+        return await worker_pool.run(
+            _render_export,
+            questions, responses, export_type, file_format, filename
+        )
+
     def _export_to_pdf(
         self,
         questions: List[Dict],
@@ -68,28 +210,13 @@ class ResultExporter:
         """Export to PDF format"""
         filepath = os.path.join(self.export_dir, f"{filename}.pdf")
 
-        # Create PDF
-        doc = SimpleDocTemplate(filepath, pagesize=letter)
+        # Create PDF (rendered in memory, written to disk once)
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
         story = []
-        styles = getSampleStyleSheet()
-
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=RGBColor(0, 0, 139),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=RGBColor(0, 0, 0),
-            spaceAfter=12
-        )
+        title_style = self.title_style
+        heading_style = self.heading_style
+        normal_style = self.normal_style
 
         # Title
         title = "Quiz Questions" if export_type == "questions_only" else "Quiz Results"
@@ -98,10 +225,13 @@ class ResultExporter:
 
         # Metadata
         date_str = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-        story.append(Paragraph(f"Generated on: {date_str}", styles['Normal']))
-        story.append(Paragraph(f"Total Questions: {len(questions)}", styles['Normal']))
+        story.append(Paragraph(f"Generated on: {date_str}", normal_style))
+        story.append(Paragraph(f"Total Questions: {len(questions)}", normal_style))
         story.append(Spacer(1, 0.3 * inch))
 
+        # Index responses once for O(1) lookup per question
+        resp_by_qid = {r.get('question_id'): r for r in (responses or [])}
+
         # Questions
         for idx, question in enumerate(questions, 1):
             # Question number and text
@@ -111,29 +241,19 @@ class ResultExporter:
             ))
             story.append(Spacer(1, 0.1 * inch))
 
-            # Options
+            # Options (one flowable per question)
+            option_lines = []
             for option in ['A', 'B', 'C', 'D']:
                 option_key = f"option_{option.lower()}"
                 option_text = question.get(option_key, '')
 
                 # Highlight correct answer if showing results
-                if export_type == "results_with_answers":
-                    if option == question.get('correct_answer'):
-                        story.append(Paragraph(
-                            f"<b>{option}. {option_text} ✓</b>",
-                            styles['Normal']
-                        ))
-                    else:
-                        story.append(Paragraph(
-                            f"{option}. {option_text}",
-                            styles['Normal']
-                        ))
+                if export_type == "results_with_answers" and option == question.get('correct_answer'):
+                    option_lines.append(f"<b>{option}. {option_text} ✓</b>")
                 else:
-                    story.append(Paragraph(
-                        f"{option}. {option_text}",
-                        styles['Normal']
-                    ))
+                    option_lines.append(f"{option}. {option_text}")
 
+            story.append(Paragraph("<br/>".join(option_lines), normal_style))
             story.append(Spacer(1, 0.1 * inch))
 
             # Show explanation if results mode
@@ -142,16 +262,13 @@ class ResultExporter:
                 if explanation:
                     story.append(Paragraph(
                         f"<i>Explanation: {explanation}</i>",
-                        styles['Normal']
+                        normal_style
                     ))
                     story.append(Spacer(1, 0.1 * inch))
 
                 # Show user answer if responses provided
                 if responses:
-                    user_resp = next(
-                        (r for r in responses if r.get('question_id') == question.get('id')),
-                        None
-                    )
+                    user_resp = resp_by_qid.get(question.get('id'))
                     if user_resp:
                         user_ans = user_resp.get('user_answer', 'Not answered')
                         is_correct = user_resp.get('is_correct', False)
@@ -159,7 +276,7 @@ class ResultExporter:
 
                         story.append(Paragraph(
                             f"Your Answer: {user_ans} - {status}",
-                            styles['Normal']
+                            normal_style
                         ))
 
             story.append(Spacer(1, 0.3 * inch))
@@ -170,6 +287,8 @@ class ResultExporter:
 
         # Build PDF
         doc.build(story)
+        with _atomic_write_path(filepath) as tmp_path, open(tmp_path, 'wb') as f:
+            f.write(buffer.getbuffer())
         return filepath
 
     def _export_to_docx(
@@ -180,6 +299,9 @@ class ResultExporter:
         filename: str
     ) -> str:
         """Export to DOCX format"""
+        if len(questions) > DOCX_STREAM_THRESHOLD:
+            return self._export_to_docx_stream(questions, responses, export_type, filename)
+
         filepath = os.path.join(self.export_dir, f"{filename}.docx")
 
         # Create document
@@ -195,43 +317,44 @@ class ResultExporter:
         doc.add_paragraph(f"Total Questions: {len(questions)}")
         doc.add_paragraph()
 
+        # Index responses once for O(1) lookup per question
+        resp_by_qid = {r.get('question_id'): r for r in (responses or [])}
+
         # Questions
         for idx, question in enumerate(questions, 1):
             # Question heading
             q_heading = doc.add_heading(f"Question {idx}", level=2)
 
             # Question text
-            q_text = doc.add_paragraph(question.get('question_text', ''))
-            q_text.runs[0].bold = True
+            q_run = doc.add_paragraph().add_run(question.get('question_text', ''))
+            q_run.bold = True
 
             # Options
             for option in ['A', 'B', 'C', 'D']:
                 option_key = f"option_{option.lower()}"
                 option_text = question.get(option_key, '')
 
-                opt_para = doc.add_paragraph(f"{option}. {option_text}")
+                opt_para = doc.add_paragraph()
+                opt_run = opt_para.add_run(f"{option}. {option_text}")
 
                 # Highlight correct answer
                 if export_type == "results_with_answers":
                     if option == question.get('correct_answer'):
-                        opt_para.runs[0].bold = True
-                        opt_para.runs[0].font.color.rgb = RGBColor(0, 128, 0)
+                        opt_run.bold = True
+                        opt_run.font.color.rgb = RGBColor(0, 128, 0)
                         opt_para.add_run(" ✓").bold = True
 
             # Explanation
             if export_type == "results_with_answers":
                 explanation = question.get('explanation', '')
                 if explanation:
-                    exp_para = doc.add_paragraph(f"Explanation: {explanation}")
-                    exp_para.runs[0].italic = True
-                    exp_para.runs[0].font.size = Pt(10)
+                    exp_run = doc.add_paragraph().add_run(f"Explanation: {explanation}")
+                    exp_run.italic = True
+                    exp_run.font.size = Pt(10)
 
                 # User response
                 if responses:
-                    user_resp = next(
-                        (r for r in responses if r.get('question_id') == question.get('id')),
-                        None
-                    )
+                    user_resp = resp_by_qid.get(question.get('id'))
                     if user_resp:
                         user_ans = user_resp.get('user_answer', 'Not answered')
                         is_correct = user_resp.get('is_correct', False)
@@ -239,14 +362,102 @@ class ResultExporter:
                         ans_para = doc.add_paragraph(f"Your Answer: {user_ans}")
 
                         if is_correct:
-                            ans_para.add_run(" - ✓ Correct").bold = True
-                            ans_para.runs[-1].font.color.rgb = RGBColor(0, 128, 0)
+                            status_run = ans_para.add_run(" - ✓ Correct")
+                            status_run.font.color.rgb = RGBColor(0, 128, 0)
                         else:
-                            ans_para.add_run(" - ✗ Incorrect").bold = True
-                            ans_para.runs[-1].font.color.rgb = RGBColor(255, 0, 0)
+                            status_run = ans_para.add_run(" - ✗ Incorrect")
+                            status_run.font.color.rgb = RGBColor(255, 0, 0)
+                        status_run.bold = True
 
             doc.add_paragraph()  # Space between questions
 
         # Save document
-        doc.save(filepath)
+        with _atomic_write_path(filepath) as tmp_path:
+            doc.save(tmp_path)
+        return filepath
+
+    def _export_to_docx_stream(
+        self,
+        questions: List[Dict],
+        responses: Optional[List[Dict]],
+        export_type: str,
+        filename: str
+    ) -> str:
+        """
+        Export to DOCX by streaming WordprocessingML into the zip archive
+
+        Produces the same content as _export_to_docx, on python-docx's default
+        template (styles, theme, page setup), without building a python-docx
+        object tree, so memory stays flat for large exports.
+        """
+        filepath = os.path.join(self.export_dir, f"{filename}.docx")
+
+        # Index responses once for O(1) lookup per question
+        resp_by_qid = {r.get('question_id'): r for r in (responses or [])}
+        show_results = export_type == "results_with_answers"
+
+        with _atomic_write_path(filepath) as tmp_path, \
+                zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            template_parts, sect_pr = _load_docx_template()
+            for name, data in template_parts:
+                archive.writestr(name, data)
+
+            with archive.open('word/document.xml', 'w') as raw:
+                def write(xml: str) -> None:
+                    raw.write(xml.encode('utf-8'))
+
+                write(_DOCX_DOCUMENT_HEAD)
+
+                # Title
+                title = "Quiz Questions" if export_type == "questions_only" else "Quiz Results"
+                write(_docx_paragraph(_docx_run(title), style="Title", center=True))
+
+                # Metadata
+                date_str = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+                write(_docx_paragraph(_docx_run(f"Generated on: {date_str}")))
+                write(_docx_paragraph(_docx_run(f"Total Questions: {len(questions)}")))
+                write(_docx_paragraph())
+
+                # Questions
+                for idx, question in enumerate(questions, 1):
+                    parts = [
+                        _docx_paragraph(_docx_run(f"Question {idx}"), style="Heading2"),
+                        _docx_paragraph(_docx_run(question.get('question_text', ''), bold=True)),
+                    ]
+
+                    # Options
+                    for option in ['A', 'B', 'C', 'D']:
+                        option_text = question.get(f"option_{option.lower()}", '')
+
+                        if show_results and option == question.get('correct_answer'):
+                            parts.append(_docx_paragraph(
+                                _docx_run(f"{option}. {option_text}", bold=True, color="008000"),
+                                _docx_run(" ✓", bold=True)
+                            ))
+                        else:
+                            parts.append(_docx_paragraph(_docx_run(f"{option}. {option_text}")))
+
+                    if show_results:
+                        # Explanation
+                        explanation = question.get('explanation', '')
+                        if explanation:
+                            parts.append(_docx_paragraph(
+                                _docx_run(f"Explanation: {explanation}", italic=True, size=20)
+                            ))
+
+                        # User response
+                        user_resp = resp_by_qid.get(question.get('id'))
+                        if user_resp:
+                            user_ans = user_resp.get('user_answer', 'Not answered')
+                            if user_resp.get('is_correct', False):
+                                status = _docx_run(" - ✓ Correct", bold=True, color="008000")
+                            else:
+                                status = _docx_run(" - ✗ Incorrect", bold=True, color="FF0000")
+                            parts.append(_docx_paragraph(_docx_run(f"Your Answer: {user_ans}"), status))
+
+                    parts.append(_docx_paragraph())  # Space between questions
+                    write("".join(parts))
+
+                write(f"{sect_pr}</w:body></w:document>")
+
         return filepath
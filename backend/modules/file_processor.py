@@ -3,10 +3,40 @@ File Processor Module
 Handles extraction of text from various file formats (PDF, DOCX, TXT)
 """
 
-import PyPDF2
+import pypdfium2
 from docx import Document
 import re
+from bisect import bisect_left
+from itertools import accumulate
 from typing import Optional
+from . import worker_pool
+
+
+_WHITESPACE = re.compile(r'\s+')
+
+# ASCII control characters left after whitespace collapsing (newline is kept)
+_CONTROL_CHARS = {c: None for c in range(0x80) if not (0x20 <= c <= 0x7E or c == 0x0A)}
+
+# PDFs above this page count are split across worker processes
+PARALLEL_PAGE_THRESHOLD = 20
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> list:
+    """Extract text from pages [start, stop) of a PDF (runs in worker processes)"""
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        pages_text = []
+        for index in range(start, stop):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                pages_text.append(textpage.get_text_range())
+            finally:
+                textpage.close()
+                page.close()
+        return pages_text
+    finally:
+        pdf.close()
 
 
 class FileProcessor:
@@ -34,14 +64,25 @@ class FileProcessor:
 
     def _extract_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file"""
-        text = ""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            pdf = pypdfium2.PdfDocument(file_path)
+            try:
+                page_count = len(pdf)
+            finally:
+                pdf.close()
+
+            workers = min(worker_pool.MAX_WORKERS, page_count)
+            if page_count > PARALLEL_PAGE_THRESHOLD and workers > 1:
+                # PDFium decodes in native code, so page ranges scale across processes
+                step = -(-page_count // workers)
+                ranges = [(file_path, start, min(start + step, page_count))
+                          for start in range(0, page_count, step)]
+                pages_text = [t for chunk in worker_pool.run_all(_extract_pdf_pages, ranges)
+                              for t in chunk]
+            else:
+                pages_text = _extract_pdf_pages(file_path, 0, page_count)
+
+            text = "\n".join(t for t in pages_text if t)
         except Exception as e:
             raise Exception(f"PDF extraction failed: {str(e)}")
 
@@ -80,14 +121,11 @@ class FileProcessor:
         - Fix line breaks
         - Remove special characters that might interfere with processing
         """
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove excessive whitespace (this also folds multiple newlines)
+        text = _WHITESPACE.sub(' ', text)
 
-        # Remove non-printable characters except newlines
-        text = re.sub(r'[^\x20-\x7E\n]', '', text)
-
-        # Fix multiple newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+        # Remove non-printable characters: drop non-ASCII, then control characters
+        text = text.encode('ascii', 'ignore').decode('ascii').translate(_CONTROL_CHARS)
 
         # Strip leading/trailing whitespace
         text = text.strip()
@@ -109,20 +147,18 @@ class FileProcessor:
         chunks = []
         sentences = text.split('. ')
 
-        current_chunk = ""
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) < chunk_size:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
+        # offsets[i] is the character position where sentence i starts ("sentence. ")
+        offsets = [0, *accumulate(len(sentence) + 2 for sentence in sentences)]
+
+        start = 0
+        for i, sentence in enumerate(sentences):
+            if i > start and offsets[i] - offsets[start] + len(sentence) >= chunk_size:
+                chunks.append((". ".join(sentences[start:i]) + ".").strip())
 
-                # Keep last part for overlap
-                words = current_chunk.split()
-                overlap_text = " ".join(words[-overlap:]) if len(words) > overlap else ""
-                current_chunk = overlap_text + " " + sentence + ". "
+                # Keep the trailing sentences that fit in the overlap window
+                start = bisect_left(offsets, offsets[i] - overlap, start + 1, i)
 
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if start < len(sentences):
+            chunks.append((". ".join(sentences[start:]) + ".").strip())
 
         return chunks
@@ -0,0 +1,102 @@
+"""
+GPU Limiter Module
+Caps the number of concurrent model generation jobs across API workers
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger("gpu_limiter")
+logger.setLevel(logging.INFO)
+
+# Drop expired holders, then claim a slot only if the set is below capacity
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1] - ARGV[2])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+    return 1
+end
+return 0
+"""
+
+
+class GPUBusyError(Exception):
+    """Raised when every GPU slot is taken"""
+
+
+class GPUSlotLimiter:
+    """
+    Redis sorted-set concurrency limiter for GPU-bound generation
+
+    Each holder is a member scored by its start time; holders older than
+    `slot_ttl` seconds are treated as crashed and evicted on the next acquire.
+    Without REDIS_URL the limit is enforced per process only.
+    """
+
+    def __init__(
+        self,
+        max_slots: Optional[int] = None,
+        slot_ttl: int = 600,
+        key: str = "mcq:gpu_slots"
+    ):
+        self.max_slots = max_slots or int(os.getenv("GPU_MAX_CONCURRENT", 4))
+        self.slot_ttl = slot_ttl
+        self.key = key
+
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            self._redis = redis.from_url(redis_url)
+            self._acquire = self._redis.register_script(_ACQUIRE_SCRIPT)
+        else:
+            self._redis = None
+            self._local_holders = 0
+            logger.warning("⚠ REDIS_URL not set. GPU slots are limited per process only.")
+
+    @asynccontextmanager
+    async def slot(self, owner: str):
+        """Hold a GPU slot for the duration of the block, or raise GPUBusyError"""
+        member = f"{owner}:{uuid.uuid4()}"
+
+        if not await self._try_acquire(member):
+            raise GPUBusyError(f"All {self.max_slots} GPU slots are busy")
+
+        try:
+            yield
+        finally:
+            await self._release(member)
+
+    async def _try_acquire(self, member: str) -> bool:
+        if self._redis is None:
+            if self._local_holders >= self.max_slots:
+                return False
+            self._local_holders += 1
+            return True
+
+        acquired = await self._acquire(
+            keys=[self.key],
+            args=[time.time(), self.slot_ttl, self.max_slots, member]
+        )
+        return bool(acquired)
+
+    async def _release(self, member: str) -> None:
+        if self._redis is None:
+            self._local_holders -= 1
+            return
+
+        try:
+            # shield so a cancelled request still frees its slot
+            await asyncio.shield(self._redis.zrem(self.key, member))
+        except Exception as e:
+            logger.error(f"❌ Failed to release GPU slot {member}: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool"""
+        if self._redis is not None:
+            await self._redis.aclose()
@@ -118,11 +118,11 @@ class QuestionGenerator:
     # MODEL GENERATOR
     # ----------------------------------------------------------------------
     def _generate_mcqs_from_chunk(self, chunk, target, attempts):
-        results = []
+        candidates = []
         seen = set()
 
         for seed in range(attempts):
-            if len(results) >= target:
+            if len(candidates) >= target:
                 break
 
             # ---------- generate question ----------
@@ -144,11 +144,13 @@ class QuestionGenerator:
             if not self._valid_answer(correct):
                 continue
 
-            # ---------- build options ----------
-            opts = self._options(correct, chunk)
-            if not opts:
-                continue
+            candidates.append((q, correct))
+
+        # ---------- build options (model distractors in one batch) ----------
+        all_opts = self._options_batch([(correct, chunk) for _, correct in candidates])
 
+        results = []
+        for (q, correct), opts in zip(candidates, all_opts):
             mcq = {
                 "question": q,
                 "options": opts,
@@ -167,11 +169,11 @@ class QuestionGenerator:
     # MODEL-ONLY FALLBACK (Paraphrasing context + regeneration)
     # ----------------------------------------------------------------------
     def _model_fallback(self, text, need):
-        fallback_mcqs = []
+        candidates = []
         sentences = text.split(". ")
 
         for i, s in enumerate(sentences):
-            if len(fallback_mcqs) >= need:
+            if len(candidates) >= need:
                 break
             if len(s.strip()) < 20:
                 continue
@@ -186,11 +188,12 @@ class QuestionGenerator:
             if not ans:
                 continue
 
-            correct = self._clean(ans)
-            opts = self._options(correct, text)
-            if not opts:
-                continue
+            candidates.append((q, self._clean(ans)))
+
+        all_opts = self._options_batch([(correct, text) for _, correct in candidates])
 
+        fallback_mcqs = []
+        for (q, correct), opts in zip(candidates, all_opts):
             fallback_mcqs.append({
                 "question": q,
                 "options": opts,
@@ -255,35 +258,46 @@ class QuestionGenerator:
     # ----------------------------------------------------------------------
     # OPTION BUILDING
     # ----------------------------------------------------------------------
-    def _options(self, correct, context):
-        distractors = []
+    def _options_batch(self, items):
+        """Build option mappings for (correct, context) pairs, batching model distractor calls"""
+        all_distractors = []
 
         # context distractors
-        caps = _CAP_PHRASE.findall(context)
-        for c in caps:
-            c2 = self._clean(c)
-            if self._valid_answer(c2) and c2.lower() != correct.lower():
-                distractors.append(c2)
-            if len(distractors) >= 3:
-                break
+        for correct, context in items:
+            distractors = []
+            caps = _CAP_PHRASE.findall(context)
+            for c in caps:
+                c2 = self._clean(c)
+                if self._valid_answer(c2) and c2.lower() != correct.lower():
+                    distractors.append(c2)
+                if len(distractors) >= 3:
+                    break
+            all_distractors.append(distractors)
 
-        # model distractor fallback
-        if len(distractors) < 3:
+        # model distractor fallback (one generate call for every item that is short)
+        short = [i for i, d in enumerate(all_distractors) if len(d) < 3]
+        if short:
             try:
-                extra = self.distractor_model.generate(
-                    question="",
-                    answer=correct,
-                    context=context,
-                    num=3 - len(distractors)
+                extra = self.distractor_model.generate_batch(
+                    [("", items[i][0], items[i][1]) for i in short],
+                    num=3
                 )
-                for e in extra:
-                    if self._valid_answer(e):
-                        distractors.append(e)
+                for i, generated in zip(short, extra):
+                    distractors = all_distractors[i]
+                    for e in generated:
                         if len(distractors) >= 3:
                             break
+                        if self._valid_answer(e):
+                            distractors.append(e)
             except:
                 pass
 
+        return [
+            self._assemble_options(correct, distractors)
+            for (correct, _), distractors in zip(items, all_distractors)
+        ]
+
+    def _assemble_options(self, correct, distractors):
         while len(distractors) < 3:
             distractors.append(correct + " Concept")
 
@@ -4,7 +4,10 @@ Evaluates quiz responses and generates detailed feedback
 Robust, deterministic grading to avoid mismatches between percent -> grade.
 """
 
+import bisect
 import logging
+import math
+from collections import Counter
 from typing import List, Dict
 
 logger = logging.getLogger("quiz_evaluator")
@@ -14,6 +17,19 @@ logger.setLevel(logging.INFO)
 class QuizEvaluator:
     """Evaluates quiz responses and provides detailed feedback"""
 
+    # Lower bounds (inclusive) of D, C, B, A, S; anything below 35 is F
+    _THRESHOLDS = (35.0, 60.0, 75.0, 85.0, 93.0)
+    _GRADES = ("F", "D", "C", "B", "A", "S")
+
+    _FEEDBACK = {
+        "S": "Outstanding performance! You scored {pct}% (Grade: S). You have mastered the concepts exceptionally well.",
+        "A": "Excellent work! You scored {pct}% (Grade: A). You show a strong understanding of the material.",
+        "B": "Good job! You scored {pct}% (Grade: B). You have a solid grasp of most concepts.",
+        "C": "Fair performance. You scored {pct}% (Grade: C). Some areas need review — check the explanations.",
+        "D": "You scored {pct}% (Grade: D). Review the material and practice more to improve.",
+        "F": "You scored {pct}% (Grade: F). Consider revisiting the material and taking the quiz again.",
+    }
+
     # =====================================================================
     # Evaluate a Single Question
     # =====================================================================
@@ -88,54 +104,37 @@ class QuizEvaluator:
     # Difficulty Stats
     # =====================================================================
     def _calculate_difficulty_stats(self, responses: List[Dict]) -> Dict:
-        stats = {
-            "Easy": {"correct": 0, "total": 0},
-            "Medium": {"correct": 0, "total": 0},
-            "Hard": {"correct": 0, "total": 0}
-        }
+        levels = ("Easy", "Medium", "Hard")
 
-        for r in responses:
-            diff = r.get("difficulty", "Medium")
-            if diff not in stats:
-                diff = "Medium"
+        # single pass: count (level, is_correct) pairs, unknown levels count as Medium
+        counts = Counter(
+            (r.get("difficulty", "Medium") if r.get("difficulty", "Medium") in levels else "Medium",
+             bool(r.get("is_correct", False)))
+            for r in responses
+        )
 
-            stats[diff]["total"] += 1
-            if r.get("is_correct", False):
-                stats[diff]["correct"] += 1
-
-        # compute percentages safely
-        for level in stats:
-            t = stats[level]["total"]
-            if t > 0:
-                stats[level]["percentage"] = round(stats[level]["correct"] / t * 100, 2)
-            else:
-                stats[level]["percentage"] = 0.0
-
-        return stats
+        return {level: self._level_stats(counts[(level, True)], counts[(level, False)]) for level in levels}
 
     # =====================================================================
     # Bloom's Taxonomy Stats
     # =====================================================================
     def _calculate_blooms_stats(self, responses: List[Dict]) -> Dict:
-        stats = {}
-
-        for r in responses:
-            level = r.get("blooms_level", "Understand")
-            if level not in stats:
-                stats[level] = {"correct": 0, "total": 0}
+        counts = Counter(
+            (r.get("blooms_level", "Understand"), bool(r.get("is_correct", False)))
+            for r in responses
+        )
 
-            stats[level]["total"] += 1
-            if r.get("is_correct", False):
-                stats[level]["correct"] += 1
+        # keep levels in first-seen order
+        levels = dict.fromkeys(level for level, _ in counts)
+        return {level: self._level_stats(counts[(level, True)], counts[(level, False)]) for level in levels}
 
-        # compute %
-        for level in stats:
-            t = stats[level]["total"]
-            stats[level]["percentage"] = round(
-                (stats[level]["correct"] / t * 100), 2
-            ) if t > 0 else 0.0
-
-        return stats
+    def _level_stats(self, correct: int, incorrect: int) -> Dict:
+        t = correct + incorrect
+        return {
+            "correct": correct,
+            "total": t,
+            "percentage": round(correct / t * 100, 2) if t > 0 else 0.0
+        }
 
     # =====================================================================
     # Grade Assignment (Your Custom Scale — deterministic)
@@ -157,18 +156,11 @@ class QuizEvaluator:
         except Exception:
             pct = 0.0
 
-        if pct >= 93.0:
-            return "S"
-        elif pct >= 85.0:
-            return "A"
-        elif pct >= 75.0:
-            return "B"
-        elif pct >= 60.0:
-            return "C"
-        elif pct >= 35.0:
-            return "D"
-        else:
-            return "F"
+        # NaN would bisect to the top grade
+        if math.isnan(pct):
+            pct = 0.0
+
+        return self._GRADES[bisect.bisect_right(self._THRESHOLDS, pct)]
 
     # =====================================================================
     # Feedback Message (Aligned with Grade System)
@@ -181,19 +173,8 @@ class QuizEvaluator:
         percentage = score_stats.get("percentage", 0.0)
         grade = score_stats.get("grade", self._assign_grade(score_stats.get("raw_percentage", percentage)))
 
-        # Compose feedback according to grade
-        if grade == "S":
-            feedback = f"Outstanding performance! You scored {percentage}% (Grade: S). You have mastered the concepts exceptionally well."
-        elif grade == "A":
-            feedback = f"Excellent work! You scored {percentage}% (Grade: A). You show a strong understanding of the material."
-        elif grade == "B":
-            feedback = f"Good job! You scored {percentage}% (Grade: B). You have a solid grasp of most concepts."
-        elif grade == "C":
-            feedback = f"Fair performance. You scored {percentage}% (Grade: C). Some areas need review — check the explanations."
-        elif grade == "D":
-            feedback = f"You scored {percentage}% (Grade: D). Review the material and practice more to improve."
-        else:  # F
-            feedback = f"You scored {percentage}% (Grade: F). Consider revisiting the material and taking the quiz again."
+        # Compose feedback according to grade (unknown grades get the F message)
+        feedback = self._FEEDBACK.get(grade, self._FEEDBACK["F"]).format(pct=percentage)
 
         # Add targeted advice if hard questions were weak
         hard_stats = score_stats.get("difficulty_stats", {}).get("Hard", {})
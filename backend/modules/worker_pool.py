@@ -0,0 +1,120 @@
+"""
+Worker Pool Module
+Shared process pool for CPU-bound work (PDF text extraction, export rendering)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger("worker_pool")
+logger.setLevel(logging.INFO)
+
+# Each worker is a full interpreter, so keep the count small on large hosts
+MAX_WORKERS = int(os.getenv("WORKER_POOL_SIZE", min(4, os.cpu_count() or 1)))
+
+# Modules the forkserver imports once, so forked workers start with them loaded.
+# Workers still re-run the parent's main script as __mp_main__ (multiprocessing does
+# this for forkserver and spawn alike), so main.py must stay cheap to import.
+_PRELOAD_MODULES = ["modules.file_processor", "modules.exporter"]
+
+# Workers only extract text and render exports; seeing these means a worker loaded the models
+_FORBIDDEN_WORKER_MODULES = ("torch", "transformers")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _mp_context():
+    """
+    Start workers without fork(): the server process holds the torch models and
+    runs other threads, and forking a multi-threaded process can deadlock.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(_PRELOAD_MODULES)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def _check_worker_imports() -> None:
+    """Warn if re-running the main script pulled the model stack into this worker"""
+    loaded = [name for name in _FORBIDDEN_WORKER_MODULES if name in sys.modules]
+    if loaded:
+        logger.warning(
+            f"⚠ Worker {os.getpid()} imported {', '.join(loaded)}; "
+            f"the main script loads them at import time instead of at startup"
+        )
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the shared pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=_mp_context(),
+                initializer=_check_worker_imports
+            )
+        return _pool
+
+
+def warm_up() -> None:
+    """Start every worker now, so the first large upload or export does not pay for it"""
+    run_all(os.getpid, [()] * MAX_WORKERS)
+
+
+def _discard_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call builds a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            logger.warning("⚠ Worker pool broke (worker died); rebuilding")
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def run_all(fn: Callable, args_list: Iterable[tuple]) -> List:
+    """Run fn(*args) for each args tuple in the pool and return results in order (blocking)"""
+    args_list = list(args_list)
+
+    # one retry: a worker killed by something else (e.g. OOM) should not fail every later call
+    for attempt in range(2):
+        pool = get_pool()
+        try:
+            futures = [pool.submit(fn, *args) for args in args_list]
+            return [f.result() for f in futures]
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+
+
+async def run(fn: Callable, *args):
+    """Run fn(*args) in the pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+
+    for attempt in range(2):
+        pool = get_pool()
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+
+
+def shutdown() -> None:
+    """Stop the worker processes"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
@@ -3,17 +3,20 @@ Setup script for Smart AI MCQ Generator Backend
 Run this script to set up the backend environment
 """
 
+import concurrent.futures
+import hashlib
+import importlib.util
 import os
 import sys
 import subprocess
 import platform
+import shutil
 
 
 def print_header(text):
     """Print formatted header"""
-    print("\n" + "=" * 60)
-    print(f"  {text}")
-    print("=" * 60 + "\n")
+    rule = "=" * 60
+    sys.stdout.write(f"\n{rule}\n  {text}\n{rule}\n\n")
 
 
 def check_python_version():
@@ -61,18 +64,20 @@ def create_env_file():
         print("❌ Error: .env.example not found")
         return False
 
-    # Copy .env.example to .env
-    with open(".env.example", "r") as src:
-        content = src.read()
-
-    with open(".env", "w") as dst:
-        dst.write(content)
+    # Copy .env.example to .env (in-kernel copy where the OS supports it)
+    shutil.copyfile(".env.example", ".env")
 
     print("✓ Created .env file from template")
     print("⚠ Please edit .env and add your Supabase credentials")
     return True
 
 
+REQUIREMENTS_SENTINEL = os.path.join(".pip-cache", ".requirements.sha256")
+
+# Packages that must come from prebuilt wheels (a source build takes many minutes)
+ONLY_BINARY = os.getenv("SETUP_ONLY_BINARY", "torch,tokenizers,transformers,numpy")
+
+
 def install_dependencies():
     """Install Python dependencies"""
     print_header("Installing Dependencies")
@@ -81,25 +86,60 @@ def install_dependencies():
         print("❌ Error: requirements.txt not found")
         return False
 
+    # Skip pip entirely when requirements.txt matches the last successful install.
+    # The interpreter is part of the hash so a new venv or Python triggers a reinstall.
+    with open("requirements.txt", "rb") as f:
+        requirements_hash = hashlib.sha256(
+            f.read() + sys.executable.encode() + sys.prefix.encode()
+        ).hexdigest()
+
+    if os.path.exists(REQUIREMENTS_SENTINEL):
+        with open(REQUIREMENTS_SENTINEL, "r") as f:
+            if f.read().strip() == requirements_hash:
+                print("✓ requirements unchanged, skipping install")
+                return True
+
     print("Installing packages... This may take 10-15 minutes")
     print("AI models will be downloaded automatically (~1-2GB)")
     print()
 
+    # Project-local cache so wheels survive wiped home directories (Docker, CI)
+    env = os.environ.copy()
+    env.setdefault("PIP_CACHE_DIR", os.path.abspath(".pip-cache"))
+
+    binary_args = [f"--only-binary={ONLY_BINARY}"] if ONLY_BINARY else []
+
     try:
+        # Fetch everything into a local wheelhouse first, then install offline from it.
+        # pip/setuptools/wheel ride along so one resolver run upgrades them with the
+        # requirements (wheel lets pip build and cache wheels from sdists).
+        # -q keeps resolver chatter off the terminal; warnings and errors still print.
         subprocess.run(
-            [sys.executable, "-m", "pip", "install", "--upgrade", "pip"],
-            check=True
+            [sys.executable, "-m", "pip", "download", "-q", "pip", "setuptools", "wheel",
+             "-r", "requirements.txt", "-d", ".wheelhouse", *binary_args],
+            check=True,
+            env=env
         )
 
         subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
-            check=True
+            [sys.executable, "-m", "pip", "install", "-q", "--no-index", "--find-links=.wheelhouse",
+             "--upgrade", "pip", "setuptools", "wheel", "-r", "requirements.txt", *binary_args],
+            check=True,
+            env=env
         )
 
+        os.makedirs(os.path.dirname(REQUIREMENTS_SENTINEL), exist_ok=True)
+        with open(REQUIREMENTS_SENTINEL, "w") as f:
+            f.write(requirements_hash)
+
         print("\n✓ All dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Error installing dependencies: {e}")
+        if ONLY_BINARY:
+            print(f"ℹ Wheels are required for: {ONLY_BINARY}")
+            print("  If none exists for your platform, rerun with SETUP_ONLY_BINARY= (empty)")
+            print("  to let pip build them from source.")
         return False
 
 
@@ -107,11 +147,13 @@ def create_directories():
     """Create necessary directories"""
     print_header("Creating Directories")
 
-    dirs = ["temp", "exports"]
+    dirs = ["temp", "exports", ".pip-cache", ".wheelhouse"]
 
     for directory in dirs:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        created = not os.path.exists(directory)
+        os.makedirs(directory, exist_ok=True)
+
+        if created:
             print(f"✓ Created {directory}/ directory")
         else:
             print(f"ℹ {directory}/ directory already exists")
@@ -132,18 +174,30 @@ def verify_setup():
         "supabase"
     ]
 
+    # Locate each package without importing it (importing torch alone takes seconds)
     all_ok = True
     for package in critical_packages:
-        try:
-            __import__(package)
+        if importlib.util.find_spec(package) is not None:
             print(f"✓ {package} is importable")
-        except ImportError:
+        else:
             print(f"❌ {package} import failed")
             all_ok = False
 
+    # Packages are missing, so the next run must not skip the install
+    if not all_ok and os.path.exists(REQUIREMENTS_SENTINEL):
+        os.remove(REQUIREMENTS_SENTINEL)
+
     return all_ok
 
 
+def _run_steps(steps):
+    """Run steps in order and return the name of the first one that fails"""
+    for step_name, step_func in steps:
+        if not step_func():
+            return step_name
+    return None
+
+
 def main():
     """Main setup function"""
     print("\n")
@@ -151,24 +205,38 @@ def main():
     print("║   Smart AI MCQ Generator - Backend Setup             ║")
     print("╚═══════════════════════════════════════════════════════╝")
 
-    # Run setup steps
-    steps = [
+    # Run setup steps. create_env_file may prompt, so it runs before pip starts
+    # writing to the terminal; create_directories overlaps with the install.
+    failed_step = _run_steps([
         ("Checking Python version", check_python_version),
         ("Checking pip", check_pip),
         ("Creating environment file", create_env_file),
-        ("Installing dependencies", install_dependencies),
-        ("Creating directories", create_directories),
-        ("Verifying setup", verify_setup),
-    ]
+    ])
 
-    failed = False
-    for step_name, step_func in steps:
-        if not step_func():
-            failed = True
-            print(f"\n❌ Setup failed at: {step_name}")
-            break
+    if not failed_step:
+        # pip runs as a subprocess, so a worker thread is enough to overlap it
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            install = executor.submit(install_dependencies)
+
+            failed_step = _run_steps([
+                ("Creating directories", create_directories),
+            ])
+
+            try:
+                installed = install.result()
+            except Exception as e:
+                print(f"\n❌ Error installing dependencies: {e}")
+                installed = False
+
+            if not installed and not failed_step:
+                failed_step = "Installing dependencies"
+
+    if not failed_step:
+        failed_step = _run_steps([
+            ("Verifying setup", verify_setup),
+        ])
 
-    if not failed:
+    if not failed_step:
         print_header("Setup Complete!")
         print("✓ Backend is ready to run")
         print()
@@ -179,8 +247,10 @@ def main():
         print("For detailed instructions, see SETUP_GUIDE.md")
         print()
     else:
+        print(f"\n❌ Setup failed at: {failed_step}")
         print_header("Setup Failed")
         print("Please fix the errors and run setup again")
+        print(f"To force a full reinstall, delete {REQUIREMENTS_SENTINEL}")
         print()
         sys.exit(1)
 